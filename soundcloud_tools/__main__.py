@@ -8,18 +8,21 @@ from soundcloud_tools.settings import get_settings
 from soundcloud_tools.weekly import create_weekly_favorite_playlist
 
 
-def main(week: int = 0, exclude_liked: bool = False, half: Literal["first", "second"] | None = None):
-    logging.basicConfig(level=logging.INFO)
-    asyncio.run(
-        create_weekly_favorite_playlist(
-            client=Client(),
+async def run(week: int = 0, exclude_liked: bool = False, half: Literal["first", "second"] | None = None):
+    async with Client() as client:
+        await create_weekly_favorite_playlist(
+            client=client,
             user_id=get_settings().user_id,
             types=["track-repost", "track"],
             week=week,
             exclude_liked=exclude_liked,
             half=half,
         )
-    )
+
+
+def main(week: int = 0, exclude_liked: bool = False, half: Literal["first", "second"] | None = None):
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(week=week, exclude_liked=exclude_liked, half=half))
 
 
 def main_script():
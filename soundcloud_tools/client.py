@@ -1,13 +1,18 @@
 # mypy: disable-error-code="empty-body"
-import json
+import asyncio
 import logging
 import re
-import urllib.parse as urlparse
 import warnings
-from typing import Any, Callable
-
-import requests
-from pydantic import BaseModel, Field, TypeAdapter
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any
+from urllib.parse import unquote_plus
+from weakref import WeakKeyDictionary
+
+import httpx
+import orjson
+from pydantic import TypeAdapter, ValidationError
 from starlette.routing import compile_path
 
 from soundcloud_tools import models as scm
@@ -17,34 +22,43 @@ from soundcloud_tools.settings import get_settings
 from soundcloud_tools.utils import chunk_list, generate_random_user_agent, get_default_kwargs
 
 logger = logging.getLogger(__name__)
+OFFSET_REGEX = re.compile(r"[?&]offset=([^&#]+)")
+TRACK_ID_REGEX = re.compile(rb'content="soundcloud://sounds:(\d+)"')
 warnings.filterwarnings("ignore", message="Unverified HTTPS request is being made")
 
 
-class SplitParams(BaseModel):
+@dataclass(slots=True)
+class SplitParams:
     client: Any
-    path_params: dict = Field(default_factory=dict)
-    query_params: dict = Field(default_factory=dict)
-    data: dict | None = None
-    content: str | None = None
-    kwargs: dict = Field(default_factory=dict)
+    path_params: dict = field(default_factory=dict)
+    query_params: dict = field(default_factory=dict)
+    data: Any = None
+    content: str | bytes | None = None
+    kwargs: dict = field(default_factory=dict)
 
     @classmethod
-    async def from_route(cls, client: Any, endpoint: Callable, path: str, **kwargs):
-        full_kwargs = get_default_kwargs(endpoint) | kwargs
+    async def from_route(
+        cls,
+        client: Any,
+        endpoint: Callable,
+        expected_path_params: frozenset[str],
+        default_kwargs: dict,
+        data_adapter: TypeAdapter[Any] | None,
+        **kwargs,
+    ):
+        full_kwargs = default_kwargs | kwargs
         params = cls(client=client)
 
         additional_params = await endpoint(client, **kwargs) or {}
-        _, _, path_param_names = compile_path(path)
-        expected_path_params = set(path_param_names)
 
         params.kwargs = full_kwargs.pop("kwargs", {})
         # Use kwargs defined in endpoint
         params.kwargs.update(additional_params.pop("kwargs", {}))
         params.data = full_kwargs.pop("data", None) or additional_params.get("data")
-        if params.data and (data_type := endpoint.__annotations__.get("data")):
+        if params.data and data_adapter:
             # Store the data as a JSON String, in order to get the validation
             # benefits from the TypeAdapter
-            params.content = TypeAdapter(data_type).dump_json(params.data)
+            params.content = data_adapter.dump_json(params.data)
         params.path_params = {k: v for k, v in full_kwargs.items() if k in expected_path_params}
         params.query_params = {k: v for k, v in full_kwargs.items() if k not in expected_path_params}
         params.query_params.update(additional_params.get("query", {}))
@@ -53,28 +67,44 @@ class SplitParams(BaseModel):
         return params
 
 
-def route(method: str, path: str, response_model: BaseModel | None = None):
+def route(method: str, path: str, response_model: type[Any] | None = None):
+    _, _, path_param_names = compile_path(path)
+    expected_path_params = frozenset(path_param_names)
+    response_adapter: TypeAdapter[Any] | None = TypeAdapter(response_model) if response_model else None
+
     def wrapper(endpoint_func):
+        default_kwargs = get_default_kwargs(endpoint_func)
+        data_type = endpoint_func.__annotations__.get("data")
+        data_adapter: TypeAdapter[Any] | None = TypeAdapter(data_type) if data_type else None
+
         async def caller(self, **kwargs):
-            split_params = await SplitParams.from_route(client=self, endpoint=endpoint_func, path=path, **kwargs)
+            split_params = await SplitParams.from_route(
+                client=self,
+                endpoint=endpoint_func,
+                expected_path_params=expected_path_params,
+                default_kwargs=default_kwargs,
+                data_adapter=data_adapter,
+                **kwargs,
+            )
             url = self.make_url(path, **split_params.path_params)
-            params = self.json_dump(split_params.query_params)
             logger.info(f"Making request to {url}")
             response = await self.make_request(
                 method,
                 url,
-                data=split_params.content,
-                params=params,
+                content=split_params.content,
+                params=split_params.query_params,
                 **split_params.kwargs,
             )
+            raw = response.content
             try:
-                response_data = response.json()
-            except json.decoder.JSONDecodeError:
-                logger.error(f"Failed to decode response (status: {response.status_code})\n{response.content}")
-                return
-            if not response_model:
-                return response_data
-            return TypeAdapter(response_model).validate_python(response_data)
+                # Decode and validate the raw body in a single pass
+                return response_adapter.validate_json(raw) if response_adapter else orjson.loads(raw)
+            except (orjson.JSONDecodeError, ValidationError) as e:
+                # Only swallow malformed JSON, invalid payloads should still surface
+                if isinstance(e, ValidationError) and e.errors()[0]["type"] != "json_invalid":
+                    raise
+                logger.error(f"Failed to decode response (status: {response.status_code})\n{raw}")
+                return None
 
         return caller
 
@@ -83,51 +113,128 @@ def route(method: str, path: str, response_model: BaseModel | None = None):
 
 class Client:
     def __init__(self, base_url: str = get_settings().base_url):
+        settings = get_settings()
         self.base_url = base_url
         self.headers = {
-            "Authorization": f"OAuth {get_settings().oauth_token}",
+            "Authorization": f"OAuth {settings.oauth_token}",
             "User-Agent": generate_random_user_agent(),
-            "x-datadome-clientid": get_settings().datadome_clientid,
+            "x-datadome-clientid": settings.datadome_clientid,
         }
         self.params = {
-            "client_id": get_settings().client_id,
+            "client_id": settings.client_id,
             "app_version": "1739181955",
             "app_locale": "en",
         }
-        self.proxies = {"https://": "https://" + get_settings().proxy} if get_settings().proxy else {}
+        self.proxy = f"https://{settings.proxy}" if settings.proxy else None
+        # Pooled connections are bound to the event loop that opened them, so each loop gets its own pool
+        self._clients: WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = WeakKeyDictionary()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if (client := self._clients.get(loop)) is None:
+            limits = httpx.Limits(max_connections=50, max_keepalive_connections=50)
+            mounts = (
+                {"https://": httpx.AsyncHTTPTransport(proxy=self.proxy, http2=True, verify=False, limits=limits)}
+                if self.proxy
+                else None
+            )
+            client = self._clients[loop] = httpx.AsyncClient(
+                http2=True,
+                limits=limits,
+                verify=False,
+                mounts=mounts,
+                timeout=30.0,
+                follow_redirects=True,
+            )
+        return client
 
-    def json_dump(self, data: Any):
-        return data if not isinstance(data, BaseModel) else data.model_dump(mode="json")
+    async def aclose(self):
+        """Closes the connection pool of the running event loop."""
+        if (client := self._clients.pop(asyncio.get_running_loop(), None)) is not None:
+            await client.aclose()
 
     async def make_request(self, method: str, url: str, **kwargs):
-        kwargs["params"] = kwargs.get("params", {}) | self.params
-        kwargs["headers"] = kwargs.get("headers", {}) | self.headers
-        if get_settings().proxy:
-            kwargs.setdefault("proxies", self.proxies)
-        kwargs.setdefault("verify", False)
+        # httpx sends `None` as an empty value, whereas the API expects unset params to be omitted
+        params = {k: v for k, v in (kwargs.get("params") or {}).items() if v is not None}
+        params.update(self.params)
+        kwargs["params"] = params
+        headers = kwargs.get("headers")
+        kwargs["headers"] = {**headers, **self.headers} if headers else self.headers
         logger.info(f"Making request {method} {url}")
-        response = requests.request(method, url, **kwargs)
+        response = await self.client.request(method, url, **kwargs)
         logger.info(f"Response {response.status_code} for {method} {response.url}")
+        logger.debug(f"Response received over {response.http_version}")
         return response
 
     def _make_request(self, *arg, **kwargs):
         return self.make_request(*arg, **kwargs)
 
     def make_url(self, path: str, **path_params: str) -> str:
-        return f"{self.base_url}/{path.format(**path_params)}"
+        # Most routes are static, so only parse the format string when there is something to fill in
+        return f"{self.base_url}/{path.format(**path_params) if path_params else path}"
 
     @staticmethod
     def get_next_offset(href: str | None) -> str | None:
         if not href:
             return None
-        parsed = urlparse.urlparse(href)
-        offset = urlparse.parse_qs(parsed.query).get("offset") or None
-        return offset and offset[0]
+        match = OFFSET_REGEX.search(href)
+        return unquote_plus(match.group(1)) if match else None
+
+    async def paginate_all(self, endpoint: Callable, limit: int = 100, max_concurrency: int = 8, **kwargs) -> list:
+        """Collects the items of all pages of a paginated endpoint.
+
+        If the first next offset equals the number of received items, the offset is positional and the
+        following pages are fetched in concurrent batches, stepping by the observed page size. Otherwise, and
+        as soon as a page breaks that pattern, `next_href` is followed page by page.
+
+        Offsets are capped by the total count if the response carries one. Without it, batches start at two
+        pages and double up to `max_concurrency`, so the last batch may request pages past the end, at most
+        as many as were fetched before it.
+        """
+        response = await endpoint(limit=limit, **kwargs)
+        if not response:
+            return []
+        items = list(response.collection)
+        offset = self.get_next_offset(response.next_href)
+        step = len(items)
+        positional = step > 0 and offset == str(step)
+        total: int | None = getattr(response, "total_results", None)
+        batch_size = max_concurrency if total is not None else 1
+        while positional and offset is not None:
+            batch_size = min(batch_size * 2, max_concurrency)
+            start = int(offset)
+            offsets = [o for o in range(start, start + batch_size * step, step) if total is None or o < total]
+            if not offsets:
+                break
+            pages = await asyncio.gather(*(endpoint(limit=limit, offset=o, **kwargs) for o in offsets))
+            for page_offset, page in zip(offsets, pages, strict=True):
+                if not page:
+                    return items
+                items += page.collection
+                offset = self.get_next_offset(page.next_href)
+                if offset != str(page_offset + step):
+                    # Short, final or cursor based page, the remaining pages of the batch are discarded
+                    positional = False
+                    break
+        while offset is not None:
+            response = await endpoint(limit=limit, offset=offset, **kwargs)
+            if not response:
+                break
+            items += response.collection
+            offset = self.get_next_offset(response.next_href)
+        return items
 
     async def get_track_id(self, url: str) -> int | None:
-        regex = r'content="soundcloud://sounds:(\d+)"'
         response = await self.make_request("GET", url)
-        match = re.search(regex, response.text)
+        # Search the raw body to avoid decoding the whole page
+        match = TRACK_ID_REGEX.search(response.content)
         return int(match.group(1)) if match else None
 
     @route("POST", "playlists", response_model=scm.Playlist)
@@ -207,15 +314,44 @@ class Client:
     ) -> UserPlaylists: ...
 
     @route("GET", "tracks", response_model=list[scm.Track])
-    async def get_tracks(self, ids: str) -> list[scm.Track]: ...
+    async def get_tracks(self, ids: list[int]):
+        return {"query": {"ids": self.prepare_track_ids(ids)}}
 
     @staticmethod
     def prepare_track_ids(ids: list[int]) -> str:
         return ",".join(map(str, ids))
 
-    async def get_all_tracks(self, track_ids: list[int], chunk_size: int = 30) -> list[scm.Track]:
-        return [
-            track
-            for track_ids_chunk in chunk_list(track_ids, n=chunk_size)
-            for track in await self.get_tracks(ids=self.prepare_track_ids(track_ids_chunk))
-        ]
+    async def iter_all_tracks(
+        self, track_ids: list[int], chunk_size: int = 30, max_concurrency: int = 20
+    ) -> AsyncIterator[scm.Track]:
+        """Yields tracks chunk by chunk as the responses arrive, so the order is not preserved.
+
+        At most `max_concurrency` chunks are in flight or waiting to be consumed at any time, the next chunk
+        is only requested once a finished one has been yielded.
+        """
+        chunks = chunk_list(track_ids, n=chunk_size)
+        pending = {asyncio.create_task(self.get_tracks(ids=chunk)) for chunk in islice(chunks, max_concurrency)}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for track in task.result():
+                        yield track
+                    if (chunk := next(chunks, None)) is not None:
+                        pending.add(asyncio.create_task(self.get_tracks(ids=chunk)))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_all_tracks(
+        self, track_ids: list[int], chunk_size: int = 30, max_concurrency: int = 20
+    ) -> list[scm.Track]:
+        # Bounds the in-flight requests to stay within the API rate limits, the pool itself allows more
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def get_chunk(track_ids_chunk: list[int]) -> list[scm.Track]:
+            async with semaphore:
+                return await self.get_tracks(ids=track_ids_chunk)
+
+        chunks = await asyncio.gather(*(get_chunk(chunk) for chunk in chunk_list(track_ids, n=chunk_size)))
+        return [track for chunk in chunks for track in chunk]
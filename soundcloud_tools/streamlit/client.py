@@ -1,3 +1,7 @@
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+
 import streamlit as st
 
 from soundcloud_tools.client import Client
@@ -12,3 +16,15 @@ class StreamlitClient(Client):
 @st.cache_resource
 def get_client():
     return StreamlitClient()
+
+
+def run[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Runs `coro` in a new event loop and closes the client's connection pool before the loop ends."""
+
+    async def main() -> T:
+        try:
+            return await coro
+        finally:
+            await get_client().aclose()
+
+    return asyncio.run(main())
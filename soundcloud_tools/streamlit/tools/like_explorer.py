@@ -1,4 +1,3 @@
-import asyncio
 import base64
 import logging
 import re
@@ -16,7 +15,7 @@ from soundcloud_tools.models.repost import Repost
 from soundcloud_tools.models.request import PlaylistCreateRequest
 from soundcloud_tools.models.track import Track
 from soundcloud_tools.settings import get_settings
-from soundcloud_tools.streamlit.client import Client, get_client
+from soundcloud_tools.streamlit.client import get_client, run
 from soundcloud_tools.streamlit.utils import display_collection_tracks
 
 logger = logging.getLogger(__name__)
@@ -25,27 +24,17 @@ logger = logging.getLogger(__name__)
 @st.cache_data
 def search_users(user_query: str) -> list[User]:
     client = get_client()
-    result = asyncio.run(client.search(q=user_query))
+    result = run(client.search(q=user_query))
     return [user for user in result.collection if user.kind == "user"]
 
 
 @st.cache_data(show_spinner="Fetching tracks", hash_funcs={"builtins.method": str})
 def fetch_collection_response(endpoint: Callable, limit: int = 100, **kwargs) -> list[Repost] | list[Track]:
-    offset: int | None = 0
-    items = []
-    while True:
-        try:
-            response = asyncio.run(endpoint(**kwargs, limit=limit, offset=offset))
-            items.extend(response.collection)
-            if not response.next_href:
-                break
-            offset = Client.get_next_offset(response.next_href)
-            logger.info("Using next offset", offset)
-        except Exception as e:
-            logger.error(e)
-            raise e
-
-    return items
+    try:
+        return run(get_client().paginate_all(endpoint, limit=limit, **kwargs))
+    except Exception as e:
+        logger.error(e)
+        raise e
 
 
 def get_type(repost):
@@ -101,7 +90,7 @@ def create_playlist(likes: list[Track], reposts: list[Repost], artist: str, filt
     )
     request = devtools.pformat(playlist.model_dump(exclude={"playlist": {"tracks"}}))
     logger.info(f"Creating playlist {request} with {len(track_ids)} tracks")
-    created_playlist = asyncio.run(get_client().post_playlist(data=playlist))
+    created_playlist = run(get_client().post_playlist(data=playlist))
     st.toast(f"Playlist created for {artist} with {len(track_ids)} tracks.", icon="🎉")
     return created_playlist
 
@@ -175,7 +164,7 @@ def update_playlist_image(user: User, playlist_id: int):
     data = requests.get(user.hq_avatar_url).content
     image_data = base64.b64encode(data).decode("utf-8")
     playlist_urn = f"soundcloud:playlists:{playlist_id}"
-    asyncio.run(
+    run(
         get_client().update_playlist_image(
             playlist_urn=playlist_urn, data=PlaylistUpdateImageRequest(image_data=image_data)
         )
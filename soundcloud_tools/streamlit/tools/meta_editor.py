@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from copy import copy
 from pathlib import Path
@@ -10,7 +9,7 @@ from streamlit import session_state as sst
 
 from soundcloud_tools.handler.track import TrackHandler, TrackInfo
 from soundcloud_tools.models import Track
-from soundcloud_tools.streamlit.client import get_client
+from soundcloud_tools.streamlit.client import get_client, run
 from soundcloud_tools.streamlit.components import (
     ARTWORK_WIDTH,
     artist_editor,
@@ -125,15 +124,15 @@ def render_soundcloud_search(query: str) -> TrackInfo | None:
     st.divider()
     track_ph = st.container(border=True)
     if track_url := url_ph.text_input("Url", key="ti_search_url"):
-        if not (track_id := asyncio.run(get_client().get_track_id(url=track_url))):
+        if not (track_id := run(get_client().get_track_id(url=track_url))):
             st.error("Could not find track id from url")
             return None
-        if not (track := asyncio.run(get_client().get_track(track_id=track_id))):
+        if not (track := run(get_client().get_track(track_id=track_id))):
             st.error("Track with id=`{track_id}` not found")
             return None
     else:
         sst.setdefault("search_result", {})
-        sst.search_result[query] = asyncio.run(get_client().search(q=query))
+        sst.search_result[query] = run(get_client().search(q=query))
         if not (result := sst.search_result.get(query)):
             return None
 
@@ -37,6 +37,7 @@ def get_week_of_month(date: datetime) -> Weekday:
 
 
 def get_default_kwargs(func):
+    """Returns a mapping of the parameters of `func` that define a default value to that default."""
     signature = inspect.signature(func)
     return {k: v.default for k, v in signature.parameters.items() if v.default is not inspect.Parameter.empty}
 
@@ -17,7 +17,6 @@ from soundcloud_tools.utils import (
     get_scheduled_time,
     get_unique_track_ids,
     get_week_of_month,
-    sort_tracks_by_playcount,
 )
 
 logger = logging.getLogger(__name__)
@@ -184,6 +183,14 @@ async def filter_tracks_for_liked(client: Client, tracks: list[Track], user_id:
     return ftracks
 
 
+async def get_track_ids_by_playcount(client: Client, track_ids: list[int]) -> list[int]:
+    """Returns the track IDs ordered by playcount, only keeping the counts of the fetched tracks in memory."""
+    playback_counts: dict[int, int] = {}
+    async for track in client.iter_all_tracks(track_ids=track_ids):
+        playback_counts[track.id] = track.playback_count or 0
+    return sorted(playback_counts, key=playback_counts.__getitem__, reverse=True)
+
+
 def get_ordered_track_ids(tracks: list[Track]) -> list[int]:
     track_ids = [track.id for track in tracks]
     return [track_id for track_id, _ in Counter(track_ids).most_common()]
@@ -216,9 +223,7 @@ async def create_weekly_favorite_playlist(
     tracks = await filter_tracks_for_seen(client=client, tracks=tracks, user_id=user_id)
     if exclude_liked:
         tracks = await filter_tracks_for_liked(client=client, tracks=tracks, user_id=user_id)
-    full_tracks = await client.get_all_tracks(track_ids=get_unique_track_ids(tracks))
-    full_tracks = sort_tracks_by_playcount(full_tracks)
-    track_ids = get_ordered_track_ids(full_tracks)
+    track_ids = await get_track_ids_by_playcount(client, track_ids=get_unique_track_ids(tracks))
     logger.info(f"Found {len(track_ids)} new unique tracks")
 
     # Create playlist from track_ids